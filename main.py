@@ -1,13 +1,46 @@
+import glob
+import hashlib
+import inspect
+import logging
+import multiprocessing
 import os
 import re
+import sys
+import tempfile
+import threading
 import time
+import zipfile
+import xml.etree.ElementTree as ET
+from fnmatch import fnmatch
+from functools import lru_cache, wraps
+from concurrent.futures import Future, ProcessPoolExecutor
+from datetime import datetime
+from itertools import chain, islice
 from pathlib import Path
-from typing import Dict, List, Optional, Set
+from typing import Callable, Dict, Iterator, List, Optional, Sequence, Set, Tuple
 import pandas as pd
 import numpy as np
-from fastapi import FastAPI, Query
-from fastapi.responses import HTMLResponse, RedirectResponse
+import openpyxl
+from openpyxl.styles.numbers import BUILTIN_FORMATS, is_date_format, is_timedelta_format
+from openpyxl.utils.datetime import CALENDAR_MAC_1904, WINDOWS_EPOCH, from_excel, from_ISO8601
+from pandas.api.types import union_categoricals
+from fastapi import FastAPI, Query, Request
+from fastapi.responses import HTMLResponse, RedirectResponse, Response
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
+
+logger = logging.getLogger(__name__)
+
+try:
+    from python_calamine import CalamineWorkbook
+except ImportError:
+    CalamineWorkbook = None
+
+try:
+    from watchdog.events import FileSystemEventHandler
+    from watchdog.observers import Observer
+except ImportError:
+    Observer = None
 
 # =========================================================
 # CONFIG - YOUR LOCAL WINDOWS PATHS
@@ -36,10 +69,20 @@ RTO_ALLOCATIONS = {
 }
 
 DEFAULT_RTOS = ['MH27', 'MH29', 'MH31', 'MH32', 'MH33', 'MH34', 'MH35', 'MH36', 'MH40', 'MH49']
+_DEFAULT_RTO_OPTIONS = ("ALL", *DEFAULT_RTOS)
+
+YEAR_OPTIONS = ("ALL", "2024", "2025", "2026")
 
 FILE_GLOB = "MH*.xlsx"
+
+_RTO_RE = re.compile(r"MH\d{2}")
+_WS_RE = re.compile(r"\s+")
+
+# SpreadsheetML namespaces used by the streaming xlsx reader
+_XL_NS = "{http://schemas.openxmlformats.org/spreadsheetml/2006/main}"
+_XL_REL_NS = "{http://schemas.openxmlformats.org/officeDocument/2006/relationships}"
+_PKG_REL_NS = "{http://schemas.openxmlformats.org/package/2006/relationships}"
 ALL_MONTHS = ["JAN", "FEB", "MAR", "APR", "MAY", "JUN", "JUL", "AUG", "SEP", "OCT", "NOV", "DEC"]
-MONTH_SET = set(ALL_MONTHS)
 
 QUARTERS = {
     'Q1': ['APR', 'MAY', 'JUN'],
@@ -48,9 +91,24 @@ QUARTERS = {
     'Q4': ['JAN', 'FEB', 'MAR']
 }
 
-_CACHE = {"df": None, "last_load": 0.0, "files": [], "months": []}
+_CACHE = {
+    "df": None, "last_load": 0.0, "last_check": 0.0, "dir_sig": None, "files": [], "months": [],
+    "rtos_list": (), "mahindra_makers": frozenset(), "watching": False, "dirty": True,
+    "years_set": frozenset(), "rtos_set": frozenset(),
+}
+_OBSERVER = None
+
+# Single-flight guard: concurrent cache misses wait on the load already running
+_LOAD_LOCK = threading.Lock()
+_LOAD_FUTURE: Optional[Future] = None
 RECHECK_SECONDS = 5
 
+# Parsed workbooks are cached here as Parquet, keyed on (year, path) plus a
+# content fingerprint; writing a new version of a workbook evicts the old one
+PARQUET_CACHE_DIR = Path(tempfile.gettempdir()) / "rto_cache"
+# Bump whenever _parse_excel_format's output changes so cached parses are redone
+PARSER_VERSION = 6
+
 app = FastAPI(title=APP_TITLE)
 
 # Add CORS middleware
@@ -62,68 +120,241 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Compress the (large, repetitive) HTML tables on the wire
+app.add_middleware(GZipMiddleware, minimum_size=1024)
+
 # =========================================================
 # HELPERS
 # =========================================================
 
-def _safe_int(x) -> int:
-    try:
-        if pd.isna(x):
-            return 0
-        if isinstance(x, str):
-            x = x.strip().replace(",", "")
-            if x == "":
-                return 0
-        v = pd.to_numeric(x, errors="coerce")
-        return int(v) if not pd.isna(v) else 0
-    except:
-        return 0
+def _coerce_regs(values: np.ndarray) -> np.ndarray:
+    """Vectorised int coercion: blanks/garbage -> 0, "1,234" -> 1234"""
+    flat = pd.Series(values.ravel())
+    regs = pd.to_numeric(flat, errors="coerce")
+    # Only cells that didn't parse as-is (blanks, "1,234") pay for string cleanup
+    retry = regs.isna()
+    if retry.any():
+        cleaned = flat[retry].astype(str).str.replace(",", "", regex=False).str.strip()
+        regs[retry] = pd.to_numeric(cleaned, errors="coerce")
+    return regs.fillna(0).to_numpy(dtype=np.float64).astype(np.int32).reshape(values.shape)
 
 
 def _extract_rto_from_filename(fp: Path) -> Optional[str]:
-    try:
-        m = re.search(r"(MH\d{2})", fp.stem.upper())
-        return m.group(1) if m else None
-    except:
-        return None
+    stem = fp.stem.upper()
+    # Files are normally named MH##..., so try the prefix before the regex
+    if len(stem) >= 4 and stem[:2] == "MH" and stem[2:4].isdigit():
+        return stem[:4]
+    m = _RTO_RE.search(stem)
+    return m.group(0) if m else None
+
+
+def _xlsx_date_styles(zf: zipfile.ZipFile) -> Dict[int, bool]:
+    """Cell style indices with a date/time number format, mapped to whether
+    the format is a duration. Decided the same way openpyxl does."""
+    if "xl/styles.xml" not in zf.namelist():
+        return {}
+    styles = ET.fromstring(zf.read("xl/styles.xml"))
+    custom = {
+        int(f.get("numFmtId")): f.get("formatCode")
+        for f in styles.iterfind(f"{_XL_NS}numFmts/{_XL_NS}numFmt")
+    }
+    date_styles = {}
+    for idx, xf in enumerate(styles.iterfind(f"{_XL_NS}cellXfs/{_XL_NS}xf")):
+        num_fmt = int(xf.get("numFmtId", 0))
+        fmt = custom.get(num_fmt, BUILTIN_FORMATS.get(num_fmt))
+        if is_date_format(fmt):
+            date_styles[idx] = is_timedelta_format(fmt)
+    return date_styles
+
+
+def _open_xlsx_sheet(zf: zipfile.ZipFile) -> Tuple[str, List[str], Dict[int, bool], datetime]:
+    """Zip member of the first worksheet, the shared string table, the date
+    styles and the workbook's date epoch"""
+    workbook = ET.fromstring(zf.read("xl/workbook.xml"))
+    sheet = workbook.find(f"{_XL_NS}sheets/{_XL_NS}sheet")
+    rel_id = sheet.get(f"{_XL_REL_NS}id")
+    rels = ET.fromstring(zf.read("xl/_rels/workbook.xml.rels"))
+    target = next(r.get("Target") for r in rels.iter(f"{_PKG_REL_NS}Relationship") if r.get("Id") == rel_id)
+    member = target.lstrip("/") if target.startswith("/") else f"xl/{target}"
+
+    shared = []
+    if "xl/sharedStrings.xml" in zf.namelist():
+        with zf.open("xl/sharedStrings.xml") as f:
+            for _, si in ET.iterparse(f):
+                if si.tag == f"{_XL_NS}si":
+                    # Plain <t>, or rich-text runs <r><t>; phonetic <rPh> runs are skipped
+                    parts = si.findall(f"{_XL_NS}t") + si.findall(f"{_XL_NS}r/{_XL_NS}t")
+                    shared.append("".join(t.text or "" for t in parts))
+                    si.clear()
+
+    props = workbook.find(f"{_XL_NS}workbookPr")
+    date1904 = props is not None and props.get("date1904", "").lower() in ("1", "true")
+    return member, shared, _xlsx_date_styles(zf), CALENDAR_MAC_1904 if date1904 else WINDOWS_EPOCH
+
+
+@lru_cache(maxsize=None)
+def _col_index(letters: str) -> int:
+    """0-based column index of a cell reference's letters, e.g. "AA" -> 26"""
+    n = 0
+    for ch in letters:
+        n = n * 26 + ord(ch) - 64
+    return n - 1
+
+
+def _iter_xlsx_rows(
+    zf: zipfile.ZipFile, member: str, shared: List[str], date_styles: Dict[int, bool], epoch: datetime,
+) -> Iterator[Sequence]:
+    """Stream worksheet rows straight from the XML. Like openpyxl, rows start
+    at row 1 / column A, gaps come back empty and date-styled numbers come
+    back as datetimes."""
+    sheet_data_tag, row_tag, cell_tag = f"{_XL_NS}sheetData", f"{_XL_NS}row", f"{_XL_NS}c"
+    v_tag, is_t_tag = f"{_XL_NS}v", f"{_XL_NS}is/{_XL_NS}t"
+    next_row = 1
+    sheet_data = None
+    with zf.open(member) as f:
+        for event, el in ET.iterparse(f, events=("start", "end")):
+            if event == "start":
+                if el.tag == sheet_data_tag:
+                    sheet_data = el
+                continue
+            if el.tag != row_tag:
+                continue
+            r = int(el.get("r", next_row))
+            while next_row < r:
+                yield ()
+                next_row += 1
+            values: List[object] = []
+            for c in el.iter(cell_tag):
+                ref = c.get("r")
+                col = _col_index(ref.rstrip("0123456789")) if ref else len(values)
+                if col > len(values):
+                    values.extend([None] * (col - len(values)))
+                t = c.get("t")
+                if t == "inlineStr":
+                    node = c.find(is_t_tag)
+                    values.append(node.text if node is not None else None)
+                    continue
+                v = c.findtext(v_tag)
+                if v is None:
+                    values.append(None)
+                elif t == "s":
+                    values.append(shared[int(v)])
+                elif t in ("str", "e"):
+                    values.append(v)
+                elif t == "b":
+                    values.append(v == "1")
+                elif t == "d":
+                    values.append(from_ISO8601(v))
+                else:
+                    value = float(v)
+                    style = int(c.get("s", 0))
+                    if style in date_styles:
+                        try:
+                            value = from_excel(value, epoch, timedelta=date_styles[style])
+                        except (OverflowError, ValueError):
+                            value = "#VALUE!"
+                    values.append(value)
+            # Finished rows would otherwise stay attached to <sheetData>
+            if sheet_data is not None:
+                sheet_data.clear()
+            else:
+                el.clear()
+            yield values
+            next_row = r + 1
 
 
-def _parse_excel_format(fp: Path, cal_year: int) -> pd.DataFrame:
+def _reader_failed(e: BaseException) -> bool:
+    """True for ordinary errors and for python-calamine's Rust panics, which
+    derive from BaseException rather than Exception"""
+    return isinstance(e, Exception) or type(e).__name__ == "PanicException"
+
+
+def _iter_sheet_rows(fp: Path) -> Iterator[Sequence]:
+    """Stream the first sheet row by row: calamine, then the built-in XML
+    reader, then openpyxl as the last resort"""
+    if CalamineWorkbook is not None:
+        # Read eagerly so a failure part-way through can still fall back
+        # without having yielded half a sheet. Keep leading empty rows and
+        # columns so positions match the other readers, which start at A1.
+        try:
+            sheet = CalamineWorkbook.from_path(str(fp)).get_sheet_by_index(0)
+            rows = sheet.to_python(skip_empty_area=False)
+        except BaseException as e:
+            if not _reader_failed(e):
+                raise
+            logger.warning("    calamine failed (%s), falling back", e)
+        else:
+            yield from rows
+            return
+
+    # Rows the XML reader already yielded; openpyxl resumes after them
+    done = 0
+    try:
+        zf = zipfile.ZipFile(fp)
+    except Exception as e:
+        logger.warning("    XML reader failed (%s), falling back to openpyxl", e)
+    else:
+        with zf:
+            try:
+                member, shared, date_styles, epoch = _open_xlsx_sheet(zf)
+            except Exception as e:
+                logger.warning("    XML reader failed (%s), falling back to openpyxl", e)
+            else:
+                try:
+                    for row in _iter_xlsx_rows(zf, member, shared, date_styles, epoch):
+                        yield row
+                        done += 1
+                except Exception as e:
+                    logger.warning("    XML reader failed after %d rows (%s), falling back to openpyxl", done, e)
+                else:
+                    return
+
+    wb = openpyxl.load_workbook(fp, read_only=True, data_only=True, keep_links=False)
     try:
-        print(f"  Reading: {fp.name}")
+        yield from islice(wb.worksheets[0].iter_rows(values_only=True), done, None)
+    finally:
+        wb.close()
+
+
+def _rows_to_array(rows: List[Sequence]) -> np.ndarray:
+    """Pack possibly ragged rows into a 2D object array padded with None"""
+    widths = {len(row) for row in rows}
+    width = max(widths, default=0)
+    arr = np.full((len(rows), width), None, dtype=object)
+    if len(widths) == 1 and width:
+        # calamine pads every row to the sheet width: one bulk copy
+        arr[...] = rows
+        return arr
+    for r, row in enumerate(rows):
+        arr[r, :len(row)] = row
+    return arr
+
+
+def _parse_excel_format(fp: Path, cal_year: int) -> Optional[pd.DataFrame]:
+    """Long-form (cal_year, rto, maker, month, regs) records, or None if unusable"""
+    try:
+        logger.debug("  Reading: %s", fp.name)
         
-        try:
-            raw = pd.read_excel(fp, sheet_name=0, header=None, engine="openpyxl")
-        except:
-            raw = pd.read_excel(fp, sheet_name=0, header=None)
+        # Cheap filename check first: without an RTO the sheet is useless
+        rto = _extract_rto_from_filename(fp)
+        if not rto:
+            logger.debug("    No RTO code in filename, skipping")
+            return None
         
-        if raw.empty:
-            return pd.DataFrame(columns=["cal_year", "rto", "maker", "month", "regs"])
-
-        month_row = None
-        for r in range(min(5, len(raw))):
-            row_vals = [str(x).strip().upper() for x in raw.iloc[r] if pd.notna(x)]
-            month_count = sum(1 for v in row_vals if v in MONTH_SET)
-            if month_count >= 1:
-                month_row = r
-                break
-
-        if month_row is None:
-            return pd.DataFrame(columns=["cal_year", "rto", "maker", "month", "regs"])
-
-        month_cols = {}
-        for c in range(raw.shape[1]):
-            val = raw.iat[month_row, c]
-            if pd.isna(val):
-                continue
-            s = str(val).strip().upper()
-            if s in MONTH_SET:
-                month_cols[c] = s
+        sheet_rows = _iter_sheet_rows(fp)
+
+        head = _rows_to_array(list(islice(sheet_rows, 5)))
+        labels = np.char.upper(np.char.strip(head.astype(str)))
+        hits = np.isin(labels, ALL_MONTHS)
+        header_rows = np.flatnonzero(hits.any(axis=1))
+        if len(header_rows) == 0:
+            return None
 
-        if not month_cols:
-            return pd.DataFrame(columns=["cal_year", "rto", "maker", "month", "regs"])
+        month_row = int(header_rows[0])
+        header_cols = np.flatnonzero(hits[month_row])
+        month_cols = dict(zip(header_cols.tolist(), labels[month_row, header_cols].tolist()))
 
-        print(f"    Found {len(month_cols)} month columns: {', '.join(sorted(set(month_cols.values())))}")
+        logger.debug("    Found %d month columns: %s", len(month_cols), ", ".join(sorted(set(month_cols.values()))))
 
         if month_cols:
             first_month_col = min(month_cols.keys())
@@ -133,50 +364,151 @@ def _parse_excel_format(fp: Path, cal_year: int) -> pd.DataFrame:
         else:
             maker_col = 1
 
-        rto = _extract_rto_from_filename(fp)
-        if not rto:
-            return pd.DataFrame(columns=["cal_year", "rto", "maker", "month", "regs"])
-
-        print(f"    RTO: {rto}")
+        logger.debug("    RTO: %s", rto)
 
+        # Rows read past the header while sniffing it are already data. Only
+        # columns up to the last month matter, and completely empty rows
+        # (blank formatted rows, gaps between blocks) never reach the cell
+        # array. The sheet is read to its last row: a gap doesn't mean the
+        # table has ended.
+        max_col = max(max(month_cols), maker_col) + 1
         rows = []
-        data_start = month_row + 1
-
-        for r in range(data_start, len(raw)):
-            maker_val = raw.iat[r, maker_col] if maker_col < raw.shape[1] else None
-            if pd.isna(maker_val):
+        for row in chain(head[month_row + 1:].tolist(), sheet_rows):
+            row = row[:max_col]
+            if all(v is None or (isinstance(v, str) and not v.strip()) for v in row):
                 continue
+            rows.append(row)
+
+        data = _rows_to_array(rows)
+        width = data.shape[1]
+        if maker_col >= width:
+            return None
+
+        maker_vals = data[:, maker_col]
+        present = pd.notna(maker_vals)
+        maker_series = pd.Series(maker_vals[present]).astype(str).str.strip().str.replace(_WS_RE, " ", regex=True)
+        keep = (maker_series.str.len() >= 2).to_numpy()
+        makers = maker_series.to_numpy()[keep]
+        data = data[present][keep]
+
+        cols = [c for c in month_cols if c < width]
+        names = np.array([month_cols[c] for c in cols], dtype=object)
+        regs = _coerce_regs(data[:, cols])
+
+        n = len(makers) * len(cols)
+        maker_codes, maker_names = pd.factorize(makers)
+        out = pd.DataFrame({
+            "cal_year": np.full(n, cal_year, dtype=np.int16),
+            "rto": pd.Categorical.from_codes(np.zeros(n, dtype=np.int8), categories=[rto]),
+            "maker": pd.Categorical.from_codes(np.repeat(maker_codes, len(cols)), categories=maker_names),
+            "month": pd.Categorical(np.tile(names, len(makers)), categories=ALL_MONTHS, ordered=True),
+            "regs": regs.ravel(),
+        })
+
+        logger.debug("    Extracted %d records", len(out))
+        return out
+
+    except BaseException as e:
+        if not _reader_failed(e):
+            raise
+        logger.warning("    ERROR reading %s: %s", fp.name, e)
+        return None
+
+
+def _parquet_cache_prefix(fp: Path, cal_year: int) -> str:
+    """Cache name shared by every version of one workbook: stem plus a hash of (year, path)"""
+    key = hashlib.blake2b(f"{cal_year}:{fp.resolve()}".encode(), digest_size=8).hexdigest()
+    return f"{fp.stem}-{key}"
+
+
+def _file_fingerprint(fp: Path) -> str:
+    """Size plus a hash of the last 64KB. An xlsx ends with the zip central
+    directory (CRC of every part), so any edit changes it even when mtime is
+    unreliable (OneDrive, network shares)."""
+    with open(fp, "rb") as f:
+        size = f.seek(0, os.SEEK_END)
+        f.seek(max(size - 65536, 0))
+        digest = hashlib.blake2b(f.read(), digest_size=8).hexdigest()
+    return f"{size}-{digest}"
 
-            maker = str(maker_val).strip()
-            maker = ' '.join(maker.split())
-            
-            if not maker or len(maker) < 2:
-                continue
 
-            for col_idx, month_name in month_cols.items():
-                if col_idx < raw.shape[1]:
-                    regs = _safe_int(raw.iat[r, col_idx])
-                    rows.append((cal_year, rto, maker, month_name, regs))
+def _parquet_cache_path(fp: Path, cal_year: int) -> Path:
+    return PARQUET_CACHE_DIR / (
+        f"{_parquet_cache_prefix(fp, cal_year)}-v{PARSER_VERSION}-{_file_fingerprint(fp)}.parquet"
+    )
 
-        print(f"    Extracted {len(rows)} records")
-        return pd.DataFrame(rows, columns=["cal_year", "rto", "maker", "month", "regs"])
 
+def _read_parquet_cache(fp: Path, cal_year: int) -> Optional[pd.DataFrame]:
+    cache_fp = _parquet_cache_path(fp, cal_year)
+    if not cache_fp.exists():
+        return None
+    try:
+        return pd.read_parquet(cache_fp)
     except Exception as e:
-        print(f"    ERROR: {str(e)}")
-        return pd.DataFrame(columns=["cal_year", "rto", "maker", "month", "regs"])
+        logger.warning("    Cache read failed for %s: %s", fp.name, e)
+        return None
 
 
-def get_rtos() -> List[str]:
-    """Get list of RTOs from data or use default"""
+def _write_parquet_cache(fp: Path, cal_year: int, dfp: pd.DataFrame) -> None:
     try:
-        df = load_all_years()
-        if not df.empty and 'rto' in df.columns:
-            rto_list = sorted(df["rto"].unique().tolist())
-            if rto_list:
-                return ["ALL"] + rto_list
-    except:
-        pass
-    return ["ALL"] + DEFAULT_RTOS
+        PARQUET_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        cache_fp = _parquet_cache_path(fp, cal_year)
+        dfp.to_parquet(cache_fp, compression="zstd", index=False)
+        # Older versions of the same workbook can never be hit again
+        for stale in PARQUET_CACHE_DIR.glob(f"{glob.escape(_parquet_cache_prefix(fp, cal_year))}-*.parquet"):
+            if stale != cache_fp:
+                stale.unlink(missing_ok=True)
+    except Exception as e:
+        logger.warning("    Cache write failed for %s: %s", fp.name, e)
+
+
+def _select_pivot(piv: pd.DataFrame, year: str, rto: str) -> pd.DataFrame:
+    """Slice a cached (cal_year, rto, maker) pivot and total it per maker"""
+    if year != "ALL":
+        piv = piv[piv.index.get_level_values("cal_year").to_numpy() == int(year)]
+    if rto != "ALL":
+        piv = piv[piv.index.get_level_values("rto") == rto]
+    return piv.groupby(level="maker", observed=True).sum()
+
+
+@lru_cache(maxsize=64)
+def _maker_month_pivot(year: str, rto: str, version: float) -> pd.DataFrame:
+    """Per-maker month totals for one filter; version is _CACHE["last_load"].
+    Callers must not modify the returned frame in place."""
+    return _select_pivot(_CACHE["pivot_month"], year, rto)
+
+
+def get_rtos() -> Tuple[str, ...]:
+    """Get list of RTOs from data or use default (computed once per load)"""
+    return _CACHE.get("rtos_list") or _DEFAULT_RTO_OPTIONS
+
+
+@lru_cache(maxsize=8)
+def _options_html(values: Tuple[str, ...]) -> str:
+    return ''.join(f'<option value="{v}" >{v}</option>' for v in values)
+
+
+def _select_options(values: Tuple[str, ...], selected: str) -> str:
+    html = _options_html(values)
+    return html.replace(f'<option value="{selected}" >', f'<option value="{selected}" selected>', 1)
+
+
+def _render_filters(rto: str, year: Optional[str] = None) -> str:
+    """Filter form with the year select only when year is given; option lists are built once"""
+    parts = ['\n    <form class="filters" method="get">\n']
+    if year is not None:
+        parts += [
+            '        <div><label>Year:</label><select name="year">\n            ',
+            _select_options(YEAR_OPTIONS, year),
+            '\n        </select></div>\n',
+        ]
+    parts += [
+        '        <div><label>RTO:</label><select name="rto">\n            ',
+        _select_options(get_rtos(), rto),
+        '\n        </select></div>\n',
+        '        <button type="submit">Apply</button>\n    </form>\n    ',
+    ]
+    return "".join(parts)
 
 
 def get_available_months() -> List[str]:
@@ -187,74 +519,235 @@ def get_available_months() -> List[str]:
     return ALL_MONTHS
 
 
-def load_all_years(force: bool = False) -> pd.DataFrame:
-    now = time.time()
-    
-    if not force and _CACHE["df"] is not None and (now - _CACHE["last_load"] < RECHECK_SECONDS):
-        return _CACHE["df"]
-
-    print("\n" + "=" * 80)
-    print("LOADING EXCEL FILES FROM YOUR WINDOWS PATHS")
-    print("=" * 80)
+def _scan_year_dirs() -> Dict[int, List[os.DirEntry]]:
+    """MH*.xlsx entries per existing year directory, sorted by name"""
+    found = {}
+    for year, dir_path in YEAR_DIRS.items():
+        if not dir_path.is_dir():
+            continue
+        with os.scandir(dir_path) as it:
+            entries = [e for e in it if fnmatch(e.name, FILE_GLOB) and e.is_file()]
+        found[year] = sorted(entries, key=lambda e: e.name)
+    return found
+
+
+def _dir_signature(scan: Dict[int, List[os.DirEntry]]) -> tuple:
+    sig = []
+    for year, entries in scan.items():
+        for e in entries:
+            st = e.stat()
+            sig.append((year, e.name, st.st_mtime_ns, st.st_size))
+    return tuple(sig)
+
+
+def _start_dir_watcher() -> None:
+    """Mark the cache dirty on MH*.xlsx changes instead of polling the directories"""
+    global _OBSERVER
+    if Observer is None:
+        logger.info("watchdog not installed - rechecking files every %ss", RECHECK_SECONDS)
+        return
+
+    class _WorkbookChangeHandler(FileSystemEventHandler):
+        def on_any_event(self, event):
+            if event.is_directory or event.event_type not in ("created", "modified", "deleted", "moved"):
+                return
+            paths = [event.src_path, getattr(event, "dest_path", "")]
+            if any(p and fnmatch(os.path.basename(p), FILE_GLOB) for p in paths):
+                _CACHE["dirty"] = True
+
+    observer = Observer()
+    handler = _WorkbookChangeHandler()
+    watched = 0
+    for dir_path in YEAR_DIRS.values():
+        if dir_path.is_dir():
+            observer.schedule(handler, str(dir_path), recursive=False)
+            watched += 1
+    observer.daemon = True
+    observer.start()
+    _OBSERVER = observer
+    # A year directory missing at startup can't be watched, so keep polling
+    # (events still speed up the watched ones) until every directory exists
+    _CACHE["watching"] = watched == len(YEAR_DIRS)
+    if not _CACHE["watching"]:
+        logger.info("Some year directories don't exist yet - rechecking files every %ss", RECHECK_SECONDS)
+
+
+def _unify_categories(parts: List[pd.DataFrame], col: str) -> None:
+    """Give every part the same categories for col so concat keeps it categorical"""
+    cats = union_categoricals([p[col].astype("category") for p in parts], sort_categories=True).categories
+    dtype = pd.CategoricalDtype(cats)
+    for p in parts:
+        p[col] = p[col].astype(dtype)
+
+
+def _load_files(scan: Dict[int, List[os.DirEntry]], sig: tuple, now: float) -> pd.DataFrame:
+    logger.info("\n" + "=" * 80)
+    logger.info("LOADING EXCEL FILES FROM YOUR WINDOWS PATHS")
+    logger.info("=" * 80)
 
     parts = []
     used = []
     found_months: Set[str] = set()
 
+    jobs: List[Tuple[int, Path]] = []
     for year, dir_path in YEAR_DIRS.items():
-        print(f"\nYear: {year}")
-        print(f"Path: {dir_path}")
+        logger.info("\nYear: %s", year)
+        logger.info("Path: %s", dir_path)
         
         if not dir_path.exists():
-            print(f"WARNING: Path does not exist: {dir_path}")
+            logger.warning("WARNING: Path does not exist: %s", dir_path)
             continue
 
-        files = list(dir_path.glob(FILE_GLOB))
-        print(f"Found {len(files)} Excel files")
+        files = [Path(e.path) for e in scan.get(year, [])]
+        logger.info("Found %d Excel files", len(files))
 
         if len(files) == 0:
-            print(f"  No MH*.xlsx files found in {dir_path}")
+            logger.info("  No MH*.xlsx files found in %s", dir_path)
             continue
 
-        for fp in sorted(files):
-            print(f"\n  Processing: {fp.name}")
-            dfp = _parse_excel_format(fp, cal_year=year)
-            if not dfp.empty:
-                parts.append(dfp)
-                used.append(str(fp))
-                file_months = set(dfp["month"].unique())
-                found_months.update(file_months)
-                print(f"    ✓ Successfully loaded {len(dfp)} records")
-            else:
-                print(f"    ✗ Could not parse this file")
+        jobs.extend((year, fp) for fp in files)
+
+    # Cache hits are read here; all remaining files across every year go
+    # through a single process pool (parsing is CPU-bound Python, so
+    # threads would just queue on the GIL).
+    results: Dict[Tuple[int, Path], Optional[pd.DataFrame]] = {}
+    misses = []
+    for year, fp in jobs:
+        cached = _read_parquet_cache(fp, year)
+        if cached is not None:
+            results[(year, fp)] = cached
+        else:
+            misses.append((year, fp))
+    logger.info("\n%d files cached, %d to parse", len(jobs) - len(misses), len(misses))
+
+    if misses:
+        years, paths = [y for y, _ in misses], [fp for _, fp in misses]
+        # A lone changed file (the usual watcher reload) or a single core
+        # isn't worth spawning workers for. Fork is unsafe here: this runs
+        # on a request thread while the watcher and server threads hold locks.
+        workers = min(len(misses), os.cpu_count() or 1)
+        ex = ProcessPoolExecutor(
+            max_workers=workers, mp_context=multiprocessing.get_context("spawn")
+        ) if workers > 1 else None
+        try:
+            parsed = ex.map(_parse_excel_format, paths, years) if ex else map(_parse_excel_format, paths, years)
+            for (year, fp), dfp in zip(misses, parsed):
+                results[(year, fp)] = dfp
+                if dfp is not None and not dfp.empty:
+                    _write_parquet_cache(fp, year, dfp)
+        finally:
+            if ex is not None:
+                ex.shutdown()
+
+    for year, fp in jobs:
+        dfp = results[(year, fp)]
+        logger.debug("\n  Processing: %s", fp.name)
+        if dfp is not None and not dfp.empty:
+            parts.append(dfp)
+            used.append(str(fp))
+            file_months = set(dfp["month"].unique())
+            found_months.update(file_months)
+            logger.debug("    ✓ Successfully loaded %d records", len(dfp))
+        else:
+            logger.warning("    ✗ Could not parse %s", fp.name)
 
     if parts:
-        df = pd.concat(parts, ignore_index=True)
+        for col in ("rto", "maker"):
+            _unify_categories(parts, col)
+        df = pd.concat(parts, ignore_index=True, copy=False, sort=False)
     else:
         df = pd.DataFrame(columns=["cal_year", "rto", "maker", "month", "regs"])
 
-    df["cal_year"] = pd.to_numeric(df["cal_year"], errors="coerce").fillna(0).astype(int)
-    df["rto"] = df["rto"].astype(str).str.upper().str.strip()
-    df["maker"] = df["maker"].astype(str).str.strip()
-    df["month"] = df["month"].astype(str).str.upper().str.strip()
-    df["regs"] = pd.to_numeric(df["regs"], errors="coerce").fillna(0).astype(int)
-
-    df = df[df["month"].isin(ALL_MONTHS)]
-
-    month_order = {m: i for i, m in enumerate(ALL_MONTHS)}
-    sorted_months = sorted(found_months, key=lambda x: month_order.get(x, 999))
-
+    # The parser already emits clean, upper-cased values; this only pins the
+    # dtypes (e.g. for older cache entries). month keeps calendar order, and
+    # anything outside ALL_MONTHS becomes NaN and is dropped.
+    df = df.astype({
+        "cal_year": np.int16,
+        "rto": "category",
+        "maker": "category",
+        "month": pd.CategoricalDtype(ALL_MONTHS, ordered=True),
+        "regs": np.int32,
+    }, copy=False)
+    df = df[df["month"].notna()].reset_index(drop=True)
+
+    sorted_months = [m for m in ALL_MONTHS if m in found_months]
+
+    # Derived views served to the pages; rebuilt with every load
+    is_mahindra = df["maker"].str.contains("MAHINDRA", case=False, regex=False).astype(bool)
+    mahindra_makers = frozenset(df.loc[is_mahindra, "maker"].unique())
+
+    _CACHE["pivot_month"] = (
+        df.groupby(["cal_year", "rto", "maker", "month"], observed=True)["regs"].sum()
+        .unstack("month", fill_value=0)
+    )
+
+    _maker_month_pivot.cache_clear()
+    _rendered_page.cache_clear()
     _CACHE["df"] = df
+    _CACHE["mahindra_makers"] = mahindra_makers
+    _CACHE["rtos_list"] = ("ALL", *sorted(df["rto"].unique().tolist())) if not df.empty else ()
+    _CACHE["rtos_set"] = frozenset(df["rto"].unique().tolist())
+    _CACHE["years_set"] = frozenset(str(y) for y in df["cal_year"].unique().tolist())
     _CACHE["last_load"] = now
+    _CACHE["last_check"] = now
+    _CACHE["dir_sig"] = sig
     _CACHE["files"] = used
     _CACHE["months"] = sorted_months
 
-    print(f"\n✓ LOADING COMPLETE")
-    print(f"  Months detected: {', '.join(sorted_months)}")
-    print(f"  Total records: {len(df)}")
-    print(f"  Files loaded: {len(used)}")
-    print("=" * 80 + "\n")
+    logger.info("\n✓ LOADING COMPLETE")
+    logger.info("  Months detected: %s", ", ".join(sorted_months))
+    logger.info("  Total records: %d", len(df))
+    logger.info("  Files loaded: %d", len(used))
+    logger.info("=" * 80 + "\n")
+
+    return df
 
+
+def load_all_years(force: bool = False) -> pd.DataFrame:
+    global _LOAD_FUTURE
+    now = time.time()
+    
+    if not force and _CACHE["df"] is not None:
+        if _CACHE["watching"]:
+            if not _CACHE["dirty"]:
+                return _CACHE["df"]
+        elif now - _CACHE["last_check"] < RECHECK_SECONDS:
+            return _CACHE["df"]
+        _CACHE["dirty"] = False
+        scan = _scan_year_dirs()
+        sig = _dir_signature(scan)
+        _CACHE["last_check"] = now
+        if sig == _CACHE["dir_sig"]:
+            return _CACHE["df"]
+    else:
+        _CACHE["dirty"] = False
+        scan = _scan_year_dirs()
+        sig = _dir_signature(scan)
+
+    with _LOAD_LOCK:
+        future = _LOAD_FUTURE
+        leader = future is None
+        if leader:
+            future = _LOAD_FUTURE = Future()
+    if not leader:
+        df = future.result()
+        if sig != _CACHE["dir_sig"]:
+            # The load we joined was started from an older scan than ours;
+            # make the next request rescan instead of trusting it
+            _CACHE["dirty"] = True
+            _CACHE["last_check"] = 0.0
+        return df
+
+    try:
+        df = _load_files(scan, sig, now)
+    except BaseException as e:
+        future.set_exception(e)
+        raise
+    else:
+        future.set_result(df)
+    finally:
+        with _LOAD_LOCK:
+            _LOAD_FUTURE = None
     return df
 
 
@@ -519,235 +1012,265 @@ def get_css() -> str:
     """
 
 
-def html_page(title: str, body: str, active: str = "main") -> str:
-    nav_items = [
-        ("Dashboard", "/", "main"),
-        ("Quarterly Analysis", "/quarterly", "quarterly"),
-        ("Unnati Wise PACL", "/unnati-pacl", "unnati"),
-        ("Month Wise", "/month-wise", "month-wise"),
-        ("Maker Growth %", "/rto-growth", "rto-growth"),
-        ("Maker Contrib %", "/rto-contribution", "rto-contrib"),
-    ]
-    
-    nav_html = ""
-    for label, url, key in nav_items:
-        cls = "active" if key == active else ""
-        nav_html += f'<a href="{url}" class="{cls}">{label}</a>'
-    
-    files_count = len(_CACHE.get("files", []))
-    months_list = get_available_months()
-    months_str = ", ".join(months_list) if months_list else "No months detected"
-    
-    return f"""<!DOCTYPE html>
+_CSS = get_css()
+
+# Static shell of html_page as bytes, split around the per-request fragments
+_PAGE_HEAD = """<!DOCTYPE html>
 <html>
 <head>
     <meta charset="utf-8">
     <meta name="viewport" content="width=device-width, initial-scale=1">
-    <title>{title}</title>
-    <style>{get_css()}</style>
+    <title>""".encode()
+_PAGE_SUBTITLE = f"""</title>
+    <style>{_CSS}</style>
 </head>
 <body>
     <div class="container">
         <div class="header">
             <div>
                 <div class="title">{APP_TITLE}</div>
-                <div class="subtitle">{title}</div>
+                <div class="subtitle">""".encode()
+_PAGE_NAV = """</div>
             </div>
             <div class="header-right">
-                <div class="nav">{nav_html}</div>
+                <div class="nav">""".encode()
+_PAGE_BODY = """</div>
                 <button class="theme-toggle" onclick="alert('Theme toggle - coming soon')">🌙 Theme</button>
             </div>
         </div>
         <div class="panel">
-            {body}
+            """.encode()
+_PAGE_FILES = """
             <div class="info">
-                Files loaded: <strong>{files_count}</strong> | 
-                Months available: <strong>{months_str}</strong> | 
+                Files loaded: <strong>""".encode()
+_PAGE_MONTHS = """</strong> | 
+                Months available: <strong>""".encode()
+_PAGE_TAIL = """</strong> | 
                 <a href="/reload">Reload</a>
             </div>
         </div>
     </div>
 </body>
-</html>"""
+</html>""".encode()
+
+
+NAV_ITEMS = [
+    ("Dashboard", "/", "main"),
+    ("Quarterly Analysis", "/quarterly", "quarterly"),
+    ("Unnati Wise PACL", "/unnati-pacl", "unnati"),
+    ("Month Wise", "/month-wise", "month-wise"),
+    ("Maker Growth %", "/rto-growth", "rto-growth"),
+    ("Maker Contrib %", "/rto-contribution", "rto-contrib"),
+]
+
+
+def _build_nav(active: str) -> bytes:
+    return "".join(
+        f'<a href="{url}" class="{"active" if key == active else ""}">{label}</a>'
+        for label, url, key in NAV_ITEMS
+    ).encode()
+
+
+# One prerendered nav per page; only the active link differs
+_NAV_BY_ACTIVE = {key: _build_nav(key) for _, _, key in NAV_ITEMS}
+
+
+@lru_cache(maxsize=8)
+def _page_footer(files_count: int, months: Tuple[str, ...]) -> bytes:
+    """Files/months info panel and closing tags; only changes when a load does"""
+    months_str = ", ".join(months) if months else "No months detected"
+    return b"".join([_PAGE_FILES, str(files_count).encode(), _PAGE_MONTHS, months_str.encode(), _PAGE_TAIL])
+
+
+def html_page(title: str, body: str, active: str = "main") -> bytes:
+    nav_html = _NAV_BY_ACTIVE.get(active) or _build_nav(active)
+    footer = _page_footer(len(_CACHE.get("files", [])), tuple(get_available_months()))
+    
+    title_b = title.encode()
+    return b"".join([
+        _PAGE_HEAD, title_b, _PAGE_SUBTITLE, title_b, _PAGE_NAV, nav_html, _PAGE_BODY, body.encode(), footer,
+    ])
+
+
+# =========================================================
+# PAGE CACHING
+# =========================================================
+
+# Page handlers by route name, registered by @etag_cached
+_PAGE_HANDLERS: Dict[str, Callable[..., HTMLResponse]] = {}
+
+
+@lru_cache(maxsize=256)
+def _rendered_page(route: str, params: Tuple[Tuple[str, str], ...], version: float) -> bytes:
+    """Rendered HTML for one route and query; version is _CACHE["last_load"]"""
+    return _PAGE_HANDLERS[route](**dict(params)).body
+
+
+def etag_cached(route: str):
+    """Serve a page from the render cache with an ETag tied to the data version,
+    answering a matching If-None-Match with 304 without rendering anything"""
+    def decorator(fn: Callable[..., HTMLResponse]):
+        _PAGE_HANDLERS[route] = fn
+        sig = inspect.signature(fn)
+        
+        @wraps(fn)
+        def wrapper(request: Request, **params):
+            load_all_years()
+            version = _CACHE["last_load"]
+            key = tuple(sorted(params.items()))
+            # Weak: GZipMiddleware re-encodes the body under the same tag
+            opaque = '"' + hashlib.blake2b(f"{route}:{key}:{version}".encode(), digest_size=16).hexdigest() + '"'
+            headers = {"ETag": "W/" + opaque, "Cache-Control": "no-cache"}
+            
+            if_none_match = request.headers.get("if-none-match", "")
+            tags = {t.strip().removeprefix("W/") for t in if_none_match.split(",")}
+            if opaque in tags or "*" in tags:
+                return Response(status_code=304, headers=headers)
+            return HTMLResponse(_rendered_page(route, key, version), headers=headers)
+        
+        request_param = inspect.Parameter("request", inspect.Parameter.POSITIONAL_OR_KEYWORD, annotation=Request)
+        wrapper.__signature__ = sig.replace(parameters=[request_param, *sig.parameters.values()])
+        return wrapper
+    return decorator
 
 
 # =========================================================
 # ROUTES
 # =========================================================
 
+def _filters_match_data(year: str, rto: str) -> bool:
+    """False when year or rto names something the loaded data doesn't contain"""
+    return (year == "ALL" or year in _CACHE["years_set"]) and (rto == "ALL" or rto in _CACHE["rtos_set"])
+
+
+def _no_data_response(filters: str, title: str, active: str) -> HTMLResponse:
+    body = filters + '<div class="error">No data found for selected filters.</div>'
+    return HTMLResponse(html_page(title, body, active=active))
+
+
+@lru_cache(maxsize=16)
+def _main_row_template(n_months: int) -> str:
+    """Positional format string for one dashboard row: class, maker cell, count/pct pairs, total"""
+    return (
+        '<tr class="{}"><td class="maker-col">{}</td>'
+        + '<td class="month-count">{}</td><td class="month-pct">{}%</td>' * n_months
+        + '<td class="total-col"><b>{}</b></td></tr>'
+    )
+
+
+@lru_cache(maxsize=16)
+def _main_header(months: Tuple[str, ...]) -> str:
+    """Two-level dashboard <thead>: month spans, then count/% columns"""
+    return (
+        '<thead><tr><th class="maker-col">MAKER</th>'
+        + "".join(f'<th colspan="2" class="month-header">{m}</th>' for m in months)
+        + '<th class="total-col">TOTAL</th></tr><tr><th class="maker-col">MAKER</th>'
+        + "".join(f'<th class="month-count">{m}</th><th class="month-pct">%{m}</th>' for m in months)
+        + '<th class="total-col">TOTAL</th></tr></thead>'
+    )
+
+
 @app.get("/", response_class=HTMLResponse)
+@etag_cached("/")
 def main(year: str = Query("ALL"), rto: str = Query("ALL")):
-    df = load_all_years()
-    years = ["ALL", "2024", "2025", "2026"]
-    rtos = get_rtos()
     months = get_available_months()
+    mahindra_makers = _CACHE["mahindra_makers"]
     
-    filters = f"""
-    <form class="filters" method="get">
-        <div><label>Year:</label><select name="year">
-            {''.join(f'<option value="{y}" {"selected" if y==year else ""}>{y}</option>' for y in years)}
-        </select></div>
-        <div><label>RTO:</label><select name="rto">
-            {''.join(f'<option value="{r}" {"selected" if r==rto else ""}>{r}</option>' for r in rtos)}
-        </select></div>
-        <button type="submit">Apply</button>
-    </form>
-    """
+    filters = _render_filters(rto, year)
+    if not _filters_match_data(year, rto):
+        return _no_data_response(filters, "Dashboard", "main")
     
-    dd = df.copy()
-    if year != "ALL":
-        dd = dd[dd["cal_year"] == int(year)]
-    if rto != "ALL":
-        dd = dd[dd["rto"] == rto]
+    pivot_counts = _maker_month_pivot(year, rto, _CACHE["last_load"])
     
-    if dd.empty:
-        body = filters + '<div class="error">No data found for selected filters.</div>'
-        return HTMLResponse(html_page("Dashboard", body, active="main"))
+    if pivot_counts.empty:
+        return _no_data_response(filters, "Dashboard", "main")
     
-    pivot_counts = dd.pivot_table(index=["maker"], columns="month", values="regs", aggfunc="sum", fill_value=0)
     pivot_counts = pivot_counts.reindex(columns=months, fill_value=0)
     pivot_counts["TOTAL"] = pivot_counts[months].sum(axis=1)
     pivot_counts = pivot_counts.sort_values("TOTAL", ascending=False)
     
-    month_totals = pivot_counts[months].sum()
-    grand_total = pivot_counts["TOTAL"].sum()
+    months_arr = pivot_counts[months].to_numpy(dtype=np.int64)
+    totals_arr = pivot_counts["TOTAL"].to_numpy(dtype=np.int64)
+    makers = pivot_counts.index.to_numpy()
+    month_totals = months_arr.sum(axis=0)
+    grand_total = int(totals_arr.sum())
+    counts = np.maximum(months_arr, 0)
+    pcts = np.rint(counts / np.where(month_totals > 0, month_totals, 1) * 100).astype(np.int32)
+    pcts[:, month_totals <= 0] = 0
+    total_pcts = np.where(grand_total > 0, np.rint(month_totals / max(grand_total, 1) * 100), 0).astype(np.int32)
     
-    table = '<div class="table-wrapper"><table><thead><tr>'
-    table += '<th class="maker-col">MAKER</th>'
-    for m in months:
-        table += f'<th colspan="2" class="month-header">{m}</th>'
-    table += '<th class="total-col">TOTAL</th></tr>'
-    table += '<tr><th class="maker-col">MAKER</th>'
-    for m in months:
-        table += f'<th class="month-count">{m}</th><th class="month-pct">%{m}</th>'
-    table += '<th class="total-col">TOTAL</th></tr></thead><tbody>'
+    out = [filters, '<div class="table-wrapper"><table>', _main_header(tuple(months)), '<tbody>']
     
-    for maker, row in pivot_counts.iterrows():
-        is_mahindra = "MAHINDRA" in maker.upper()
-        row_class = 'mahindra-highlight' if is_mahindra else ''
-        table += f'<tr class="{row_class}"><td class="maker-col"><strong>{maker}</strong></td>'
-        gt = row["TOTAL"]
-        
-        for m in months:
-            count = int(row[m]) if row[m] > 0 else 0
-            pct = (count / month_totals[m] * 100) if month_totals[m] > 0 else 0
-            table += f'<td class="month-count">{count}</td><td class="month-pct">{pct:.0f}%</td>'
-        
-        table += f'<td class="total-col"><b>{int(gt)}</b></td></tr>'
+    # Interleave count/pct columns so each row is a single template format
+    cells = np.empty((len(makers), 2 * len(months)), dtype=np.int64)
+    cells[:, 0::2] = counts
+    cells[:, 1::2] = pcts
+    row_tmpl = _main_row_template(len(months))
     
-    table += '<tr class="grand-total-row"><td class="maker-col">TOTAL</td>'
-    for m in months:
-        total = int(month_totals[m])
-        pct = (month_totals[m] / grand_total * 100) if grand_total > 0 else 0
-        table += f'<td class="month-count">{total}</td><td class="month-pct">{pct:.0f}%</td>'
-    table += f'<td class="total-col"><b>{int(grand_total)}</b></td></tr>'
-    table += '</tbody></table></div>'
+    for maker, row_cells, gt in zip(makers, cells.tolist(), totals_arr.tolist()):
+        row_class = 'mahindra-highlight' if maker in mahindra_makers else ''
+        out.append(row_tmpl.format(row_class, f"<strong>{maker}</strong>", *row_cells, gt))
     
-    body = filters + table
+    total_cells = np.empty(2 * len(months), dtype=np.int64)
+    total_cells[0::2] = month_totals
+    total_cells[1::2] = total_pcts
+    out.append(row_tmpl.format("grand-total-row", "TOTAL", *total_cells.tolist(), grand_total))
+    out.append('</tbody></table></div>')
+    
+    body = "".join(out)
     return HTMLResponse(html_page("Dashboard", body, active="main"))
 
 
 @app.get("/quarterly", response_class=HTMLResponse)
+@etag_cached("/quarterly")
 def quarterly_analysis(rto: str = Query("ALL")):
     df = load_all_years()
-    rtos = get_rtos()
     
-    filters = f"""
-    <form class="filters" method="get">
-        <div><label>RTO:</label><select name="rto">
-            {''.join(f'<option value="{r}" {"selected" if r==rto else ""}>{r}</option>' for r in rtos)}
-        </select></div>
-        <button type="submit">Apply</button>
-    </form>
-    """
+    filters = _render_filters(rto)
     
     body = filters + '<div class="info">Quarterly analysis comparing F25 (Apr2024-Mar2025) vs F26 (Apr2025-Mar2026)</div>'
     return HTMLResponse(html_page("Quarterly Analysis", body, active="quarterly"))
 
 
 @app.get("/unnati-pacl", response_class=HTMLResponse)
+@etag_cached("/unnati-pacl")
 def unnati_pacl_page(year: str = Query("ALL"), rto: str = Query("ALL")):
     df = load_all_years()
-    years = ["ALL", "2024", "2025", "2026"]
-    rtos = get_rtos()
     
-    filters = f"""
-    <form class="filters" method="get">
-        <div><label>Year:</label><select name="year">
-            {''.join(f'<option value="{y}" {"selected" if y==year else ""}>{y}</option>' for y in years)}
-        </select></div>
-        <div><label>RTO:</label><select name="rto">
-            {''.join(f'<option value="{r}" {"selected" if r==rto else ""}>{r}</option>' for r in rtos)}
-        </select></div>
-        <button type="submit">Apply</button>
-    </form>
-    """
+    filters = _render_filters(rto, year)
     
     body = filters + '<div class="info">Unnati vs PACL dealer allocation analysis</div>'
     return HTMLResponse(html_page("Unnati Wise PACL", body, active="unnati"))
 
 
 @app.get("/month-wise", response_class=HTMLResponse)
+@etag_cached("/month-wise")
 def month_wise_page(year: str = Query("ALL"), rto: str = Query("ALL")):
     df = load_all_years()
-    years = ["ALL", "2024", "2025", "2026"]
-    rtos = get_rtos()
     
-    filters = f"""
-    <form class="filters" method="get">
-        <div><label>Year:</label><select name="year">
-            {''.join(f'<option value="{y}" {"selected" if y==year else ""}>{y}</option>' for y in years)}
-        </select></div>
-        <div><label>RTO:</label><select name="rto">
-            {''.join(f'<option value="{r}" {"selected" if r==rto else ""}>{r}</option>' for r in rtos)}
-        </select></div>
-        <button type="submit">Apply</button>
-    </form>
-    """
+    filters = _render_filters(rto, year)
     
     body = filters + '<div class="info">Month-wise analysis with year-over-year comparison</div>'
     return HTMLResponse(html_page("Month Wise Analysis", body, active="month-wise"))
 
 
 @app.get("/rto-growth", response_class=HTMLResponse)
+@etag_cached("/rto-growth")
 def rto_growth_page(year: str = Query("ALL"), rto: str = Query("ALL")):
     df = load_all_years()
-    years = ["ALL", "2024", "2025", "2026"]
-    rtos = get_rtos()
     
-    filters = f"""
-    <form class="filters" method="get">
-        <div><label>Year:</label><select name="year">
-            {''.join(f'<option value="{y}" {"selected" if y==year else ""}>{y}</option>' for y in years)}
-        </select></div>
-        <div><label>RTO:</label><select name="rto">
-            {''.join(f'<option value="{r}" {"selected" if r==rto else ""}>{r}</option>' for r in rtos)}
-        </select></div>
-        <button type="submit">Apply</button>
-    </form>
-    """
+    filters = _render_filters(rto, year)
     
     body = filters + '<div class="info">Maker growth percentage analysis</div>'
     return HTMLResponse(html_page("Maker Growth %", body, active="rto-growth"))
 
 
 @app.get("/rto-contribution", response_class=HTMLResponse)
+@etag_cached("/rto-contribution")
 def rto_contribution_page(year: str = Query("ALL"), rto: str = Query("ALL")):
     df = load_all_years()
-    years = ["ALL", "2024", "2025", "2026"]
-    rtos = get_rtos()
     
-    filters = f"""
-    <form class="filters" method="get">
-        <div><label>Year:</label><select name="year">
-            {''.join(f'<option value="{y}" {"selected" if y==year else ""}>{y}</option>' for y in years)}
-        </select></div>
-        <div><label>RTO:</label><select name="rto">
-            {''.join(f'<option value="{r}" {"selected" if r==rto else ""}>{r}</option>' for r in rtos)}
-        </select></div>
-        <button type="submit">Apply</button>
-    </form>
-    """
+    filters = _render_filters(rto, year)
     
     body = filters + '<div class="info">Maker contribution percentage analysis</div>'
     return HTMLResponse(html_page("Maker Contribution %", body, active="rto-contrib"))
@@ -761,6 +1284,7 @@ def reload_data():
 
 @app.on_event("startup")
 def startup():
+    logging.basicConfig(level=logging.INFO, format="%(message)s", stream=sys.stdout)
     print("\n" + "="*80)
     print("MAHINDRA RTO DASHBOARD - STARTING")
     print("="*80)
@@ -768,11 +1292,19 @@ def startup():
     print(f"2024: {YEAR_DIRS[2024]}")
     print(f"2025: {YEAR_DIRS[2025]}")
     print(f"2026: {YEAR_DIRS[2026]}")
+    _start_dir_watcher()
     load_all_years(force=True)
     print("\n✓ Dashboard ready! Visit: http://localhost:8000")
     print("="*80 + "\n")
 
 
+@app.on_event("shutdown")
+def shutdown():
+    if _OBSERVER is not None:
+        _OBSERVER.stop()
+        _OBSERVER.join(timeout=5)
+
+
 if __name__ == "__main__":
     import uvicorn
     print("\n🚀 Starting Mahindra RTO Dashboard...")
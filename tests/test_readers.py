@@ -0,0 +1,163 @@
+"""The calamine and built-in XML readers must return what openpyxl returns for the same sheet"""
+import zipfile
+from datetime import date, datetime, time, timedelta
+
+import openpyxl
+import pytest
+from openpyxl.utils.datetime import CALENDAR_MAC_1904
+
+import main
+
+
+def _basic(wb):
+    ws = wb.active
+    ws.append(["RTO WISE REGISTRATIONS"])
+    ws.append([None, "MAKER", "JAN", "FEB", "MAR"])
+    ws.append([1, "TATA MOTORS", 120, 98.5, None])
+    ws.append([2, "MAHINDRA & MAHINDRA", "1,234", 0, True])
+    ws["C7"] = 5
+    ws["H7"] = "far right"
+    ws["B9"] = "KIA"
+
+
+def _dates(wb):
+    ws = wb.active
+    ws.append(["MAKER", "JAN", "FEB", "MAR", "APR"])
+    ws.append(["HYUNDAI", datetime(2024, 1, 5), date(2024, 2, 29), time(13, 30), timedelta(hours=30)])
+    ws.append(["SKODA", 45296, 0.25, 12, -3])
+    ws["C3"].number_format = "dd/mm/yyyy"
+    ws["D3"].number_format = "0.00%"
+    ws["E3"].number_format = '"Qty "0'
+
+
+def _iso_dates(wb):
+    wb.iso_dates = True
+    ws = wb.active
+    ws.append(["MAKER", "JAN"])
+    ws.append(["HONDA", datetime(2025, 3, 1, 8, 15)])
+    ws.append(["TOYOTA", date(2025, 4, 2)])
+
+
+def _leading_gap(wb):
+    ws = wb.active
+    ws["B2"] = "RTO WISE REGISTRATIONS"
+    ws["C6"] = "JAN"
+    ws["D6"] = "FEB"
+    ws["B7"] = "TATA"
+    ws["C7"] = 5
+    ws["D7"] = 6
+
+
+def _epoch_1904(wb):
+    wb.epoch = CALENDAR_MAC_1904
+    ws = wb.active
+    ws.append(["MAKER", "JAN"])
+    ws.append(["MG", datetime(2024, 1, 5)])
+
+
+def _save(tmp_path, build, name="MH27_2024.xlsx"):
+    wb = openpyxl.Workbook()
+    build(wb)
+    fp = tmp_path / name
+    wb.save(fp)
+    return fp
+
+
+def _openpyxl_rows(fp):
+    wb = openpyxl.load_workbook(fp, read_only=True, data_only=True)
+    try:
+        return [list(row) for row in wb.worksheets[0].iter_rows(values_only=True)]
+    finally:
+        wb.close()
+
+
+def _xml_rows(fp):
+    with zipfile.ZipFile(fp) as zf:
+        return [list(row) for row in main._iter_xlsx_rows(zf, *main._open_xlsx_sheet(zf))]
+
+
+def _calamine_rows(fp):
+    if main.CalamineWorkbook is None:
+        pytest.skip("python-calamine not installed")
+    return [list(row) for row in main._iter_sheet_rows(fp)]
+
+
+def _cell(v):
+    """calamine reads empty cells as "" and midnight datetimes as dates"""
+    if v == "":
+        return None
+    if isinstance(v, datetime) and v.time() == time():
+        return v.date()
+    return v
+
+
+def _trimmed(rows):
+    """openpyxl pads rows to the sheet width; compare without trailing blanks"""
+    out = []
+    for row in rows:
+        row = [_cell(v) for v in row]
+        while row and row[-1] is None:
+            row = row[:-1]
+        out.append(row)
+    return out
+
+
+@pytest.mark.parametrize("read", [_xml_rows, _calamine_rows])
+@pytest.mark.parametrize("build", [_basic, _dates, _iso_dates, _leading_gap, _epoch_1904])
+def test_reader_matches_openpyxl(tmp_path, build, read):
+    fp = _save(tmp_path, build)
+    assert _trimmed(read(fp)) == _trimmed(_openpyxl_rows(fp))
+
+
+def test_date_styled_month_cell_is_not_a_count(tmp_path, monkeypatch):
+    monkeypatch.setattr(main, "CalamineWorkbook", None)
+    fp = _save(tmp_path, _dates)
+    out = main._parse_excel_format(fp, 2024)
+    regs = out.set_index(["maker", "month"])["regs"]
+    assert regs[("HYUNDAI", "JAN")] == 0
+    assert regs[("SKODA", "JAN")] == 45296
+
+
+def test_xml_reader_failure_resumes_with_openpyxl(tmp_path, monkeypatch):
+    fp = _save(tmp_path, _basic)
+    real = main._iter_xlsx_rows
+
+    def broken(*args):
+        rows = real(*args)
+        yield next(rows)
+        yield next(rows)
+        raise ValueError("corrupt row")
+
+    monkeypatch.setattr(main, "CalamineWorkbook", None)
+    monkeypatch.setattr(main, "_iter_xlsx_rows", broken)
+    rows = [list(row) for row in main._iter_sheet_rows(fp)]
+    assert _trimmed(rows) == _trimmed(_openpyxl_rows(fp))
+
+
+def _spacer(wb):
+    ws = wb.active
+    ws.append(["MAKER", "JAN", "FEB"])
+    ws.append(["TATA", 10, 20])
+    for _ in range(12):
+        ws.append([None, 1, 1])
+    ws.append(["KIA", 30, 40])
+
+
+def _gap(wb):
+    ws = wb.active
+    ws.append(["MAKER", "JAN", "FEB"])
+    ws.append(["TATA", 10, 20])
+    ws["A16"] = "KIA"
+    ws["B16"] = 30
+    ws["C16"] = 40
+
+
+@pytest.mark.parametrize("calamine", [True, False])
+@pytest.mark.parametrize("build", [_spacer, _gap])
+def test_rows_after_a_gap_are_kept(tmp_path, monkeypatch, build, calamine):
+    if not calamine:
+        monkeypatch.setattr(main, "CalamineWorkbook", None)
+    elif main.CalamineWorkbook is None:
+        pytest.skip("python-calamine not installed")
+    out = main._parse_excel_format(_save(tmp_path, build), 2024)
+    assert set(out["maker"]) == {"TATA", "KIA"}